@@ -1,10 +1,14 @@
 import requests
 import json
+import numpy as np
 from collections import defaultdict
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 import time
 import sys
+import os
+from math import comb
+from concurrent.futures import ProcessPoolExecutor
 
 # ================== 0. 全局常量 & 配置 ==================
 # 🔥 请务必替换成你的 Worker 域名
@@ -19,12 +23,14 @@ COL_SERIES = 5
 COL_SERIES_WR = 6
 COL_GAME = 7
 COL_GAME_WR = 8
-COL_STREAK = 9
-COL_LAST_DATE = 10
+COL_ELO = 9
+COL_STREAK = 10
+COL_LAST_DATE = 11
 
 INDEX_FILE = Path("index.html")
 TEAMS_JSON = Path("teams.json")
 TOURNAMENTS_FILE = Path("tournaments.json") 
+RATINGS_FILE = Path("ratings.json")
 TOURNAMENT_DIR = Path("tournament")
 GITHUB_REPO = "https://github.com/closur3/lol"
 
@@ -142,7 +148,8 @@ def scrape(tournament):
         "series_wins": 0, "series_total": 0, 
         "game_wins": 0, "game_total": 0, 
         "streak_wins": 0, "streak_losses": 0, 
-        "streak_dirty": False, "last_date": None
+        "streak_dirty": False, "last_date": None,
+        "elo": None
     })
     
     valid_matches = []
@@ -320,8 +327,354 @@ def generate_markdown_time_table(time_data):
     
     return md
 
-# ================== 5. 输出生成 ==================
-def save_markdown(tournament, team_stats, global_matches):
+# ================== 5. 交手矩阵 (Head-to-Head) ==================
+H2H_BO_LIST = (3, 5) # 满局统计只看 BO3 / BO5, 与时间分布表口径一致
+
+def process_h2h_stats(matches):
+    # 队名 -> 整数 id, 比赛列表 -> 并行数组, 之后一次 bincount 填满所有矩阵
+    teams = sorted({m["t1"] for m in matches} | {m["t2"] for m in matches})
+    team_id = {team: i for i, team in enumerate(teams)}
+    n = len(teams)
+
+    h2h = {
+        "teams": teams,
+        "series": np.zeros((n, n), dtype=np.int64),      # series[i, j]: i 赢 j 的场次
+        "games": np.zeros((n, n), dtype=np.int64),       # games[i, j]: i 对 j 赢的小局
+        "full": np.zeros((len(H2H_BO_LIST), n, n), dtype=np.int64),  # 对称
+        "total": np.zeros((len(H2H_BO_LIST), n, n), dtype=np.int64), # 对称
+        "matches": defaultdict(list)
+    }
+    if not matches: return h2h
+
+    count = len(matches)
+    t1 = np.fromiter((team_id[m["t1"]] for m in matches), dtype=np.int64, count=count)
+    t2 = np.fromiter((team_id[m["t2"]] for m in matches), dtype=np.int64, count=count)
+    s1 = np.fromiter((m["s1"] for m in matches), dtype=np.int64, count=count)
+    s2 = np.fromiter((m["s2"] for m in matches), dtype=np.int64, count=count)
+    bo = np.fromiter((int(m["best_of"]) for m in matches), dtype=np.int64, count=count)
+
+    winner = np.where(s1 > s2, t1, t2)
+    loser = np.where(s1 > s2, t2, t1)
+    size = n * n
+
+    h2h["series"] = np.bincount(winner * n + loser, minlength=size).reshape(n, n)
+    h2h["games"] = (
+        np.bincount(t1 * n + t2, weights=s1, minlength=size) +
+        np.bincount(t2 * n + t1, weights=s2, minlength=size)
+    ).astype(np.int64).reshape(n, n)
+
+    # bo_slot: BO3 -> 0, BO5 -> 1, 其他赛制 -> -1 (不计入满局统计)
+    bo_slot = np.full(count, -1, dtype=np.int64)
+    for slot, bo_val in enumerate(H2H_BO_LIST): bo_slot[bo == bo_val] = slot
+    counted = bo_slot >= 0
+    is_full = counted & (np.minimum(s1, s2) == bo // 2)
+
+    pair = bo_slot * size + t1 * n + t2
+    total = np.bincount(pair[counted], minlength=len(H2H_BO_LIST) * size).reshape(len(H2H_BO_LIST), n, n)
+    full = np.bincount(pair[is_full], minlength=len(H2H_BO_LIST) * size).reshape(len(H2H_BO_LIST), n, n)
+    h2h["total"] = total + total.transpose(0, 2, 1)
+    h2h["full"] = full + full.transpose(0, 2, 1)
+
+    # 弹窗用的对局明细 (只需按队伍对分组)
+    for m in matches:
+        i, j = team_id[m["t1"]], team_id[m["t2"]]
+        is_full_match = (m["best_of"] == "3" and min(m["s1"], m["s2"]) == 1) or (m["best_of"] == "5" and min(m["s1"], m["s2"]) == 2)
+        match_str_html = f"<span class='date'>{m['date'].strftime('%m-%d')}</span> <span class='{'full-match' if is_full_match else ''}'>{m['t1']} vs {m['t2']} <b>{m['s1']}-{m['s2']}</b> <span style='color:#94a3b8'>BO{m['best_of']}</span></span>"
+        h2h["matches"][(min(i, j), max(i, j))].append(match_str_html)
+
+    return h2h
+
+def h2h_team_order(h2h):
+    # 按大场胜数降序, 其次按小局净胜, 最后按队名
+    series_wins = h2h["series"].sum(axis=1)
+    game_diff = h2h["games"].sum(axis=1) - h2h["games"].sum(axis=0)
+    return sorted(range(len(h2h["teams"])), key=lambda i: (-series_wins[i], -game_diff[i], h2h["teams"][i]))
+
+def generate_markdown_h2h_table(h2h):
+    md = "\n### Head-to-Head\n\n"
+    md += "| Matchup | Series | Games | BO3 Full | BO5 Full |\n"
+    md += "| :--- | :--- | :--- | :--- | :--- |\n"
+
+    teams = h2h["teams"]
+    order = h2h_team_order(h2h)
+    rows = 0
+    for a_pos, i in enumerate(order):
+        for j in order[a_pos + 1:]:
+            if h2h["series"][i, j] + h2h["series"][j, i] == 0: continue
+            cells = []
+            for slot in range(len(H2H_BO_LIST)):
+                full, total = h2h["full"][slot, i, j], h2h["total"][slot, i, j]
+                cells.append(f"{full}/{total} ({int(full / total * 100)}%)" if total > 0 else "-")
+            md += f"| {teams[i]} vs {teams[j]} | {h2h['series'][i, j]}-{h2h['series'][j, i]} | {h2h['games'][i, j]}-{h2h['games'][j, i]} | {cells[0]} | {cells[1]} |\n"
+            rows += 1
+
+    if rows == 0:
+        md += "| - | - | - | - | - |\n"
+    return md
+
+def generate_h2h_html(title, h2h, table_id):
+    teams = h2h["teams"]
+    if not teams: return ""
+    order = h2h_team_order(h2h)
+
+    html = f"""
+    <div class="wrapper">
+        <div class="table-title">⚔️ Head-to-Head · {title}</div>
+        <table id="{table_id}" class="h2h-table" style="min-width:{120 + 80 * len(teams)}px">
+            <thead>
+                <tr>
+                    <th class="team-col">TEAM</th>"""
+    for j in order: html += f"<th>{teams[j]}</th>"
+    html += "</tr></thead><tbody>"
+
+    for i in order:
+        html += f"<tr><td class='team-col'>{teams[i]}</td>"
+        for j in order:
+            if i == j:
+                html += "<td style='background:#e2e8f0'></td>"
+                continue
+            wins, losses = h2h["series"][i, j], h2h["series"][j, i]
+            if wins + losses == 0:
+                html += "<td style='background:#f1f5f9; color:#cbd5e1'>-</td>"
+                continue
+            full = h2h["full"][:, i, j].sum()
+            total = h2h["total"][:, i, j].sum()
+            detail = f"{h2h['games'][i, j]}-{h2h['games'][j, i]}" + (f"<br>{full}/{total} full" if total > 0 else "")
+            matches_json = json.dumps(h2h["matches"][(min(i, j), max(i, j))]).replace("'", "&apos;").replace('"', '&quot;')
+            bg_color = color_by_ratio(rate(wins, wins + losses))
+            html += f"<td style='background:{bg_color}; color:white; font-weight:bold; cursor:pointer;' onclick='showMatches(\"{teams[i]} vs {teams[j]}\", {matches_json})'>{wins}-{losses}<div style='font-size:11px; opacity:0.8; font-weight:normal'>{detail}</div></td>"
+        html += "</tr>"
+
+    html += "</tbody></table></div>"
+    return html
+
+# ================== 6. 战力评分 (Elo) ==================
+ELO_BASE = 1500
+ELO_SCALE = 400
+ELO_K = 32
+ELO_MARGIN = 0.5 # 让分系数: 2-0 / 3-0 比 2-1 / 3-2 多拿的权重
+BACKTEST_K = np.arange(8, 81, 4)
+BACKTEST_MARGIN = np.linspace(0, 1.5, 16)
+
+def elo_expected(rating_a, rating_b):
+    return 1 / (1 + 10 ** ((rating_b - rating_a) / ELO_SCALE))
+
+def elo_weight(s1, s2, bo, k, margin):
+    # dominance: 赢家领先的小局 / 需要赢的小局, BO3 2-0 = 1, 2-1 = 0.5; BO5 3-2 = 1/3
+    dominance = abs(s1 - s2) / (bo // 2 + 1)
+    return k * (1 + margin * dominance)
+
+def match_key(m):
+    return (m["date"], m["order"])
+
+def load_ratings():
+    if RATINGS_FILE.exists():
+        try: return json.loads(RATINGS_FILE.read_text(encoding='utf-8'))
+        except: pass
+    return {}
+
+def save_ratings(store):
+    smart_write(RATINGS_FILE, json.dumps(store, indent=4, ensure_ascii=False) + "\n")
+
+def match_id(m):
+    return f"{m['date'].isoformat()}|{m['order']}|{m['t1']}|{m['t2']}|{m['s1']}-{m['s2']}"
+
+def update_ratings(store, slug, matches):
+    # 按比赛身份增量更新; 参数变化, 已处理的比赛消失/比分被改, 或新比赛排在已处理比赛之前时从头重算
+    params = {"base": ELO_BASE, "k": ELO_K, "margin": ELO_MARGIN}
+    entry = store.get(slug)
+    if not matches:
+        # 抓取失败或暂无完场比赛: 保留已持久化的评分, 不写空数据
+        print(f"   ⚠️ Elo: no completed matches for {slug}, keeping stored ratings", flush=True)
+        return entry["ratings"] if entry else {}
+
+    current_ids = {match_id(m) for m in matches}
+    if not entry or entry.get("params") != params or not set(entry.get("processed", [])) <= current_ids:
+        entry = {"params": params, "processed": [], "ratings": {}}
+
+    processed = set(entry["processed"])
+    new_matches = [m for m in matches if match_id(m) not in processed]
+    if processed and new_matches:
+        last_key = max(match_key(m) for m in matches if match_id(m) in processed)
+        if match_key(new_matches[0]) < last_key:
+            print(f"   ↩️ Elo: late result before last processed match, rebuilding {slug}", flush=True)
+            entry = {"params": params, "processed": [], "ratings": {}}
+            new_matches = matches
+
+    ratings = entry["ratings"]
+    for m in new_matches:
+        t1, t2, s1, s2 = m["t1"], m["t2"], m["s1"], m["s2"]
+        r1, r2 = ratings.get(t1, ELO_BASE), ratings.get(t2, ELO_BASE)
+        delta = elo_weight(s1, s2, int(m["best_of"]), ELO_K, ELO_MARGIN) * ((1 if s1 > s2 else 0) - elo_expected(r1, r2))
+        ratings[t1] = round(r1 + delta, 2)
+        ratings[t2] = round(r2 - delta, 2)
+
+    entry["processed"] = entry["processed"] + [match_id(m) for m in new_matches]
+    store[slug] = entry
+    print(f"   📈 Elo: {len(new_matches)} new matches applied for {slug}", flush=True)
+    return ratings
+
+def backtest_ratings(matches, k_values=BACKTEST_K, margin_values=BACKTEST_MARGIN):
+    # 所有 (K, margin) 组合同时回放: ratings 形状为 (组合数, 队伍数), 每场比赛一次向量化更新
+    k_grid, margin_grid = np.meshgrid(np.asarray(k_values, dtype=float), np.asarray(margin_values, dtype=float), indexing="ij")
+    k_grid, margin_grid = k_grid.ravel(), margin_grid.ravel()
+
+    teams = sorted({m["t1"] for m in matches} | {m["t2"] for m in matches})
+    team_id = {team: i for i, team in enumerate(teams)}
+    ratings = np.full((len(k_grid), len(teams)), float(ELO_BASE))
+    loss_sum = np.zeros(len(k_grid))
+
+    for m in matches:
+        i, j = team_id[m["t1"]], team_id[m["t2"]]
+        t1_won = 1 if m["s1"] > m["s2"] else 0
+        expected = np.clip(elo_expected(ratings[:, i], ratings[:, j]), 1e-12, 1 - 1e-12)
+        loss_sum -= np.log(expected) if t1_won else np.log(1 - expected)
+
+        delta = elo_weight(m["s1"], m["s2"], int(m["best_of"]), k_grid, margin_grid) * (t1_won - expected)
+        ratings[:, i] += delta
+        ratings[:, j] -= delta
+
+    return {"k": k_grid, "margin": margin_grid, "loss_sum": loss_sum, "count": len(matches)}
+
+def print_backtest_report(title, result, top=None):
+    # 默认打印全部 (K, margin) 组合, 按 log-loss 升序; top 只保留最好的 N 个
+    print(f"\n📊 Backtest: {title} ({result['count']} matches)")
+    if result["count"] == 0:
+        print("   (no completed matches)")
+        return
+    log_loss = result["loss_sum"] / result["count"]
+    print(f"   {'K':>6} {'MARGIN':>8} {'LOG-LOSS':>10}")
+    for idx in np.argsort(log_loss)[:top]:
+        mark = " ⬅ current" if np.isclose(result["k"][idx], ELO_K) and np.isclose(result["margin"][idx], ELO_MARGIN) else ""
+        print(f"   {result['k'][idx]:>6.0f} {result['margin'][idx]:>8.2f} {log_loss[idx]:>10.4f}{mark}")
+    current = np.isclose(result["k"], ELO_K) & np.isclose(result["margin"], ELO_MARGIN)
+    if current.any():
+        print(f"   current K={ELO_K} MARGIN={ELO_MARGIN}: {log_loss[current][0]:.4f}")
+
+# ================== 7. 赛程模拟 (Monte Carlo) ==================
+MC_SIMULATIONS = 100_000
+MC_CHUNK = 10_000
+MC_SEED = 2026 # 固定种子: 数据不变时输出不变, smart_write 才能跳过
+MC_TOP_N = (4, 8)
+
+def series_win_prob(p_game, bo):
+    # 单局胜率 p -> BOn 系列赛胜率: 先拿 k 局, 对手在此之前拿了 j 局
+    need = bo // 2 + 1
+    return sum(comb(need - 1 + j, j) * p_game ** need * (1 - p_game) ** j for j in range(need))
+
+def game_win_prob(p_series, bo):
+    # Elo 是按系列赛结果拟合的, 模拟前二分反解出对应的单局胜率
+    low, high = np.zeros_like(p_series), np.ones_like(p_series)
+    for bo_val in np.unique(bo):
+        mask = bo == bo_val
+        for _ in range(50):
+            mid = (low[mask] + high[mask]) / 2
+            too_low = series_win_prob(mid, int(bo_val)) < p_series[mask]
+            low[mask] = np.where(too_low, mid, low[mask])
+            high[mask] = np.where(too_low, high[mask], mid)
+    return (low + high) / 2
+
+def simulate_chunk(seed, sims, t1, t2, s1, s2, p_game, bo, base_wins, base_diff):
+    # 一个进程跑 sims 次: 从当前比分 (进行中的系列赛) 开始抽剩余小局, 先到 k 胜的一方拿下系列赛
+    rng = np.random.default_rng(seed)
+    n_teams, count = len(base_wins), len(t1)
+    need = bo // 2 + 1
+
+    games = rng.random((sims, count, 5)) < p_game[:, None]
+    played = np.cumsum(games, axis=2, dtype=np.int8)
+    w1 = s1[:, None].astype(np.int8) + played
+    w2 = s2[:, None].astype(np.int8) + np.arange(1, 6, dtype=np.int8) - played
+    finished = (w1 >= need[:, None]) | (w2 >= need[:, None])
+    end = finished.argmax(axis=2)[..., None]
+    g1 = np.take_along_axis(w1, end, axis=2)[..., 0].astype(np.int64)
+    g2 = np.take_along_axis(w2, end, axis=2)[..., 0].astype(np.int64)
+
+    sim_offset = (np.arange(sims) * n_teams)[:, None]
+    winner = np.where(g1 > g2, t1, t2)
+    wins = np.bincount((sim_offset + winner).ravel(), minlength=sims * n_teams).reshape(sims, n_teams)
+    diff = (
+        np.bincount((sim_offset + t1).ravel(), weights=(g1 - g2).ravel(), minlength=sims * n_teams) +
+        np.bincount((sim_offset + t2).ravel(), weights=(g2 - g1).ravel(), minlength=sims * n_teams)
+    ).reshape(sims, n_teams)
+
+    # 排名: 大场胜数 > 小局净胜 > 随机
+    score = (wins + base_wins) * 1000 + (diff + base_diff) + rng.random((sims, n_teams))
+    rank = np.argsort(np.argsort(-score, axis=1), axis=1)
+    rank_counts = np.bincount((np.arange(n_teams) * n_teams + rank).ravel(), minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+    return {
+        "wins": wins.sum(axis=0),
+        "rank_counts": rank_counts,
+        "full": (np.minimum(g1, g2) == need - 1).sum(axis=0)
+    }
+
+def simulate_standings(team_stats, future_matches, ratings, sims=MC_SIMULATIONS):
+    teams = sorted(set(team_stats) | {m["t1"] for m in future_matches} | {m["t2"] for m in future_matches})
+    if not future_matches or not teams: return None
+    team_id = {team: i for i, team in enumerate(teams)}
+    n = len(teams)
+
+    count = len(future_matches)
+    t1 = np.fromiter((team_id[m["t1"]] for m in future_matches), dtype=np.int64, count=count)
+    t2 = np.fromiter((team_id[m["t2"]] for m in future_matches), dtype=np.int64, count=count)
+    bo = np.fromiter((min(int(m["best_of"]), 5) for m in future_matches), dtype=np.int64, count=count)
+    s1 = np.fromiter((m["s1"] for m in future_matches), dtype=np.int64, count=count)
+    s2 = np.fromiter((m["s2"] for m in future_matches), dtype=np.int64, count=count)
+    strength = np.array([ratings.get(team, ELO_BASE) for team in teams], dtype=float)
+    p_game = game_win_prob(elo_expected(strength[t1], strength[t2]), bo)
+
+    base_wins = np.array([team_stats[t]["series_wins"] if t in team_stats else 0 for t in teams])
+    base_losses = np.array([team_stats[t]["series_total"] - team_stats[t]["series_wins"] if t in team_stats else 0 for t in teams])
+    base_diff = np.array([2 * team_stats[t]["game_wins"] - team_stats[t]["game_total"] if t in team_stats else 0 for t in teams])
+
+    chunks = [min(MC_CHUNK, sims - start) for start in range(0, sims, MC_CHUNK)]
+    seeds = np.random.SeedSequence(MC_SEED).spawn(len(chunks))
+    with ProcessPoolExecutor(max_workers=min(len(chunks), os.cpu_count() or 1)) as pool:
+        results = list(pool.map(
+            simulate_chunk, seeds, chunks,
+            *[[arr] * len(chunks) for arr in (t1, t2, s1, s2, p_game, bo, base_wins, base_diff)]
+        ))
+
+    wins = sum(r["wins"] for r in results) / sims
+    rank_prob = sum(r["rank_counts"] for r in results) / sims
+    match_full = sum(r["full"] for r in results) / sims
+
+    projection = {"sims": sims, "teams": {}}
+    for i, team in enumerate(teams):
+        future_count = np.count_nonzero(t1 == i) + np.count_nonzero(t2 == i)
+        stat = team_stats.get(team, {})
+        entry = {
+            "wins": base_wins[i] + wins[i],
+            "losses": base_losses[i] + future_count - wins[i],
+            "avg_rank": float((rank_prob[i] * np.arange(1, n + 1)).sum()),
+            "rank_prob": rank_prob[i]
+        }
+        for bo_val in (3, 5):
+            mask = (bo == bo_val) & ((t1 == i) | (t2 == i))
+            full = stat.get(f"bo{bo_val}_full", 0) + match_full[mask].sum()
+            total = stat.get(f"bo{bo_val}_total", 0) + np.count_nonzero(mask)
+            entry[f"bo{bo_val}_rate"] = rate(full, total)
+        projection["teams"][team] = entry
+    return projection
+
+def generate_markdown_projection_table(projection):
+    if not projection: return ""
+    n = len(projection["teams"])
+    top_n = [k for k in MC_TOP_N if k < n]
+
+    md = f"\n### Projection ({projection['sims']:,} simulations)\n\n"
+    md += "| TEAM | PROJ. RECORD | AVG RANK | 1ST |" + "".join(f" TOP {k} |" for k in top_n) + " BO3 FULLRATE | BO5 FULLRATE |\n"
+    md += "| :--- | :--- | :--- | :--- |" + " :--- |" * len(top_n) + " :--- | :--- |\n"
+
+    for team, p in sorted(projection["teams"].items(), key=lambda x: x[1]["avg_rank"]):
+        line = f"| {team} | {p['wins']:.1f}-{p['losses']:.1f} | {p['avg_rank']:.1f} | {p['rank_prob'][0] * 100:.1f}% |"
+        for k in top_n: line += f" {p['rank_prob'][:k].sum() * 100:.1f}% |"
+        line += f" {pct(p['bo3_rate'])} | {pct(p['bo5_rate'])} |"
+        md += line + "\n"
+    return md
+
+# ================== 8. 输出生成 ==================
+def save_markdown(tournament, team_stats, global_matches, h2h, projection):
     now = datetime.now(CST).strftime("%Y-%m-%d %H:%M:%S CST")
     lp_url = f"https://lol.fandom.com/wiki/{tournament['overview_page'].replace(' ', '_')}"
     
@@ -339,8 +692,8 @@ def save_markdown(tournament, team_stats, global_matches):
 
 ## Statistics
 
-| TEAM | BO3 FULL | BO3 FULLRATE | BO5 FULL | BO5 FULLRATE | SERIES | SERIES WR | GAMES | GAME WR | STREAK | LAST DATE |
-|------|----------|--------------|----------|--------------|--------|-----------|-------|---------|--------|-----------|
+| TEAM | BO3 FULL | BO3 FULLRATE | BO5 FULL | BO5 FULLRATE | SERIES | SERIES WR | GAMES | GAME WR | ELO | STREAK | LAST DATE |
+|------|----------|--------------|----------|--------------|--------|-----------|-------|---------|-----|--------|-----------|
 """
     
     for team_name, stat in sorted_teams:
@@ -358,11 +711,15 @@ def save_markdown(tournament, team_stats, global_matches):
         streak_display = f"{stat['streak_wins']}W" if stat['streak_wins'] > 0 else (f"{stat['streak_losses']}L" if stat['streak_losses'] > 0 else "-")
         last_date_display = stat["last_date"].strftime("%Y-%m-%d %H:%M") if stat["last_date"] else "-"
         
-        md_content += f"| {team_name} | {bo3_text} | {pct(bo3_ratio)} | {bo5_text} | {pct(bo5_ratio)} | {series_text} | {pct(series_win_ratio)} | {game_text} | {pct(game_win_ratio)} | {streak_display} | {last_date_display} |\n"
+        elo_text = f"{stat['elo']:.0f}" if stat.get('elo') is not None else "-"
+        
+        md_content += f"| {team_name} | {bo3_text} | {pct(bo3_ratio)} | {bo5_text} | {pct(bo5_ratio)} | {series_text} | {pct(series_win_ratio)} | {game_text} | {pct(game_win_ratio)} | {elo_text} | {streak_display} | {last_date_display} |\n"
     
     time_stats = process_time_stats(global_matches)
     md_table = generate_markdown_time_table(time_stats)
     md_content += md_table
+    md_content += generate_markdown_h2h_table(h2h)
+    md_content += generate_markdown_projection_table(projection)
     
     md_content += f"\n---\n\n*Generated by [LoL Stats Scraper]({GITHUB_REPO})*\n"
     
@@ -433,7 +790,7 @@ def generate_time_table_html(time_data):
     """
     return html
 
-def build(all_data, all_matches_global, is_done_today):
+def build(all_data, all_matches_global, is_done_today, h2h_data, h2h_global):
     now_str = datetime.now(CST).strftime("%Y-%m-%d %H:%M:%S")
     time_table_html = generate_time_table_html(process_time_stats(all_matches_global))
     
@@ -470,8 +827,12 @@ def build(all_data, all_matches_global, is_done_today):
         .col-series-wr {{ width: 100px; }}
         .col-game {{ width: 80px; }}
         .col-game-wr {{ width: 100px; }}
+        .col-elo {{ width: 70px; }}
         .col-streak {{ width: 80px; }}
         .col-last {{ width: 130px; }}
+        .h2h-table td {{ white-space: normal; padding: 8px 4px; line-height: 1.3; }}
+        .h2h-table th {{ cursor: default; }}
+        .h2h-table th:hover {{ background: #f8fafc; color: #64748b; }}
         .badge {{ color: white; border-radius: 4px; padding: 3px 7px; font-size: 11px; font-weight: 700; }}
         .footer {{ text-align: center; font-size: 12px; color: #94a3b8; margin: 40px 0; }}
         
@@ -495,6 +856,7 @@ def build(all_data, all_matches_global, is_done_today):
         team_stats = all_data.get(tournament["slug"], {})
         table_id = f"t{index}"
         dates = [stat["last_date"] for stat in team_stats.values() if stat["last_date"]]
+        elos = [stat["elo"] for stat in team_stats.values() if stat.get("elo") is not None]
         
         lp_url = f"https://lol.fandom.com/wiki/{tournament['overview_page'].replace(' ', '_')}"
         archive_link = f"tournament/{tournament['slug']}.md"
@@ -513,6 +875,7 @@ def build(all_data, all_matches_global, is_done_today):
                         <th colspan="2" onclick="doSort({COL_BO5_PCT}, '{table_id}')" style="text-align:center;">BO5 FULLRATE</th>
                         <th colspan="2" onclick="doSort({COL_SERIES_WR}, '{table_id}')" style="text-align:center;">SERIES</th>
                         <th colspan="2" onclick="doSort({COL_GAME_WR}, '{table_id}')" style="text-align:center;">GAMES</th>
+                        <th class="col-elo" onclick="doSort({COL_ELO}, '{table_id}')">ELO</th>
                         <th class="col-streak" onclick="doSort({COL_STREAK}, '{table_id}')">STREAK</th>
                         <th class="col-last" onclick="doSort({COL_LAST_DATE}, '{table_id}')">LAST DATE</th>
                     </tr>
@@ -539,6 +902,10 @@ def build(all_data, all_matches_global, is_done_today):
             bo5_text = f"{stat['bo5_full']}/{stat['bo5_total']}" if stat['bo5_total'] > 0 else "-"
             series_text = f"{stat['series_wins']}-{stat['series_total']-stat['series_wins']}" if stat['series_total'] > 0 else "-"
             game_text = f"{game_wins}-{game_total-game_wins}" if game_total > 0 else "-"
+            elo = stat.get("elo")
+            elo_text = f"{elo:.0f}" if elo is not None else "-"
+            elo_ratio = None
+            if elo is not None: elo_ratio = (elo - min(elos)) / (max(elos) - min(elos)) if max(elos) != min(elos) else 0.5
 
             html += f"""
                 <tr>
@@ -551,6 +918,7 @@ def build(all_data, all_matches_global, is_done_today):
                     <td class="col-series-wr" style="background:{color_by_ratio(series_win_ratio)};color:{'white' if series_win_ratio is not None else '#cbd5e1'};font-weight:bold">{pct(series_win_ratio)}</td>
                     <td class="col-game" style="background:{'#f1f5f9' if game_total == 0 else 'transparent'};color:{'#cbd5e1' if game_total == 0 else 'inherit'}">{game_text}</td>
                     <td class="col-game-wr" style="background:{color_by_ratio(game_win_ratio)};color:{'white' if game_win_ratio is not None else '#cbd5e1'};font-weight:bold">{pct(game_win_ratio)}</td>
+                    <td class="col-elo" style="background:{color_by_ratio(elo_ratio)};color:{'white' if elo_ratio is not None else '#cbd5e1'};font-weight:bold">{elo_text}</td>
                     <td class="col-streak" style="background:{'#f1f5f9' if stat['streak_wins'] == 0 and stat['streak_losses'] == 0 else 'transparent'};color:{'#cbd5e1' if stat['streak_wins'] == 0 and stat['streak_losses'] == 0 else 'inherit'}">{streak_display}</td>
                     <td class="col-last" style="background:{'#f1f5f9' if not stat['last_date'] else 'transparent'};color:{color_by_date(stat['last_date'], dates) if stat['last_date'] else '#cbd5e1'};font-weight:700">{last_date_display}</td>
                 </tr>"""
@@ -558,6 +926,11 @@ def build(all_data, all_matches_global, is_done_today):
 
     html += time_table_html
 
+    for index, tournament in enumerate(TOURNAMENTS):
+        h2h = h2h_data.get(tournament["slug"])
+        if h2h: html += generate_h2h_html(tournament["title"], h2h, f"h2h{index}")
+    html += generate_h2h_html("All Regions", h2h_global, "h2h-all")
+
     html += f"""
     <div class="footer">{status_html} | <a href="{GITHUB_REPO}" target="_blank" style="color:inherit; text-decoration:none">Updated: {now_str}</a></div>
     </div>
@@ -628,7 +1001,11 @@ def build(all_data, all_matches_global, is_done_today):
 
         function showPopup(title, dayIndex, matches) {{
             const days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday", "Total"];
-            document.getElementById('modalTitle').innerText = title + " - " + days[dayIndex];
+            showMatches(title + " - " + days[dayIndex], matches);
+        }}
+
+        function showMatches(title, matches) {{
+            document.getElementById('modalTitle').innerText = title;
             const list = document.getElementById('modalList');
             list.innerHTML = "";
             
@@ -665,6 +1042,10 @@ def build(all_data, all_matches_global, is_done_today):
 if __name__ == "__main__":
     print("Starting LoL Stats Scraper (Global View)...", flush=True)
     
+    backtest_mode = "--backtest" in sys.argv
+    backtest_top = int(sys.argv[sys.argv.index("--top") + 1]) if "--top" in sys.argv else None
+    rating_store = load_ratings()
+    
     data_store = []
     all_matches_global = [] 
     all_future_matches = [] 
@@ -677,15 +1058,36 @@ if __name__ == "__main__":
         all_matches_global.extend(matches)
         all_future_matches.extend(futures)
         
+        if backtest_mode:
+            print_backtest_report(tournament["title"], backtest_ratings(matches), backtest_top)
+            continue
+        
+        ratings = update_ratings(rating_store, tournament["slug"], matches)
+        for team, stat in team_stats.items(): stat["elo"] = ratings.get(team)
+        
+        start = time.time()
+        projection = simulate_standings(team_stats, futures, ratings)
+        if projection:
+            print(f"   🎲 Simulated {len(futures)} remaining series x {projection['sims']:,} in {time.time() - start:.1f}s", flush=True)
+        
         data_store.append({
             "tournament": tournament,
-            "stats": team_stats
+            "stats": team_stats,
+            "h2h": process_h2h_stats(matches),
+            "projection": projection
         })
     
+    if backtest_mode:
+        all_matches_global.sort(key=match_key)
+        print_backtest_report("ALL REGIONS", backtest_ratings(all_matches_global), backtest_top)
+        sys.exit(0)
+    
     print("\nWriting files with GLOBAL data...", flush=True)
     
+    save_ratings(rating_store)
+    
     for item in data_store:
-        save_markdown(item["tournament"], item["stats"], all_matches_global)
+        save_markdown(item["tournament"], item["stats"], all_matches_global, item["h2h"], item["projection"])
     
     today_str = datetime.now(CST).strftime("%Y-%m-%d")
     remaining_today = [
@@ -695,7 +1097,8 @@ if __name__ == "__main__":
     is_done_for_today = (len(remaining_today) == 0)
 
     html_data = {item["tournament"]["slug"]: item["stats"] for item in data_store}
-    build(html_data, all_matches_global, is_done_for_today)
+    h2h_data = {item["tournament"]["slug"]: item["h2h"] for item in data_store}
+    build(html_data, all_matches_global, is_done_for_today, h2h_data, process_h2h_stats(all_matches_global))
     
     print(f"\n[Smart Sleep] Remaining matches for {today_str}: {len(remaining_today)}")
     print("\n✅ All done!", flush=True)